@@ -1,10 +1,12 @@
 import os, sys, shutil, tempfile, subprocess
+from pathlib import Path
 from dotenv import load_dotenv
-import whisper
 from google import genai
 from elevenlabs.client import ElevenLabs
 from voice_cloner import VoiceCloner
 import random
+sys.path.append(str(Path(__file__).parent / 'detection-Files'))
+import asr_cache
 load_dotenv()
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 # ================== HARD-CODE YOUR SETTINGS ==================
@@ -70,12 +72,8 @@ def remux_video_with_new_audio(mp4, new_audio, out_mp4):
 
 def transcribe_whisper(wav16k, model_name=WHISPER_MODEL):
     print("📝 Transcribing…")
-    # Optional: pin whisper cache dir if you like:
-    # CACHE = os.path.expanduser("~/.cache/whisper")
-    # os.makedirs(CACHE, exist_ok=True)
-    model = whisper.load_model(model_name)  # , download_root=CACHE
-    res = model.transcribe(wav16k, fp16=False)
-    return res["text"].strip()
+    # faster-whisper (int8 on CPU), shared model cache with the stutter detector
+    return asr_cache.transcribe(wav16k, model_size=model_name)
 
 def clean_text_with_gemini(raw_text, mode=CLEAN_MODE):
     print("🧼 Cleaning text…")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Shared faster-whisper model cache
+Every transcription path loads Whisper through here, so each model
+is loaded once per process no matter how many callers use it
+"""
+
+import os
+import threading
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+
+# Concurrent transcribe() calls (e.g. parallel server requests) run in parallel
+# on the same model instead of queueing behind one CTranslate2 worker
+NUM_WORKERS = int(os.environ.get("ASR_NUM_WORKERS", "2"))
+
+_models = {}
+_pipelines = {}
+_lock = threading.Lock()
+
+
+def get_model(model_size="small", device="cpu", compute_type="int8"):
+    """Return the cached WhisperModel for these settings (loaded on first use)"""
+    key = (model_size, device, compute_type)
+    with _lock:
+        if key not in _models:
+            print(f"Loading Whisper model ({model_size}, {device}, {compute_type})...")
+            _models[key] = WhisperModel(model_size, device=device, compute_type=compute_type,
+                                        num_workers=NUM_WORKERS)
+        return _models[key]
+
+
+def get_batched_pipeline(model_size="small", device="cpu", compute_type="int8"):
+    """Return a BatchedInferencePipeline wrapping the cached model"""
+    key = (model_size, device, compute_type)
+    model = get_model(model_size, device, compute_type)
+    with _lock:
+        if key not in _pipelines:
+            _pipelines[key] = BatchedInferencePipeline(model=model)
+        return _pipelines[key]
+
+
+def transcribe(audio, model_size="base", device="cpu", compute_type="int8", batch_size=None, **kwargs):
+    """
+    Transcribe a file path (or 16kHz float32 samples) to plain text
+    batch_size: decode VAD chunks batch_size at a time with the batched pipeline (best on GPU)
+    Extra keyword arguments are passed to transcribe
+    """
+    if batch_size:
+        segments, _ = get_batched_pipeline(model_size, device, compute_type).transcribe(
+            audio, batch_size=batch_size, **kwargs
+        )
+        return "".join(segment.text for segment in segments).strip()
+    
+    # vad_filter skips silence; condition_on_previous_text=False avoids
+    # hallucinated/"corrected" text on disfluent speech
+    options = {'vad_filter': True, 'condition_on_previous_text': False}
+    options.update(kwargs)
+    
+    segments, _ = get_model(model_size, device, compute_type).transcribe(audio, **options)
+    return "".join(segment.text for segment in segments).strip()
@@ -5,6 +5,7 @@ Generate audio from practice scripts using ElevenLabs
 
 import sys
 import os
+import functools
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -16,6 +17,12 @@ except ImportError:
     print("⚠️  Please install: pip3 install elevenlabs")
     sys.exit(1)
 
+@functools.lru_cache(maxsize=None)
+def _get_client(api_key):
+    """One ElevenLabs client per key, so its HTTP connection pool is reused across calls"""
+    return ElevenLabs(api_key=api_key)
+
+
 def generate_practice_audio(script_file, output_file=None):
     """Generate audio from a practice script"""
     
@@ -27,8 +34,8 @@ def generate_practice_audio(script_file, output_file=None):
         print("Get a key at: https://elevenlabs.io/")
         return
     
-    # Initialize ElevenLabs client
-    client = ElevenLabs(api_key=api_key)
+    # Get (cached) ElevenLabs client
+    client = _get_client(api_key)
     
     # Read script
     with open(script_file, 'r') as f:
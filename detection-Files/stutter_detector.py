@@ -4,12 +4,16 @@ SIMPLIFIED Stutter Detection
 Clean, simple rules - no complex algorithms
 """
 
-import sys, re, json, numpy as np, librosa, soundfile as sf, os
-from faster_whisper import WhisperModel
-from pydub import AudioSegment
+import sys, re, json, numpy as np, os, hashlib, tempfile, itertools, functools
+from asr_cache import get_model
+from concurrent.futures import ThreadPoolExecutor
 
 # ============== SIMPLE PARAMETERS ==============
 WHISPER_MODEL = "small"
+WHISPER_MODEL_FAST = "tiny"  # ~8x faster on CPU, rougher word boundaries
+FAST_MODE = os.getenv("STUTTER_FAST_MODE", "0").lower() in ("1", "true", "yes")
+if FAST_MODE:
+    WHISPER_MODEL = WHISPER_MODEL_FAST
 IGNORE_FIRST_SECONDS = 0.0  # Don't ignore any stutters based on time (disabled)
 
 # Detection thresholds (super simple!)
@@ -19,27 +23,74 @@ PROLONGATION_CONSONANT = 1.3 # Word duration >= 1.3s for prolongable consonants
 MIN_REPETITIONS = 3          # Need 3+ words in a row to be a repetition
 MIN_SINGLE_LETTER_REPS = 4   # Single letters need 4+ reps
 
+# Sample rates: Whisper expects 16kHz, onset detection is tuned for 22.05kHz
+# (hop 512 = 23ms frames - at 16kHz the frames are 32ms and close bursts merge)
+WHISPER_SR = 16000
+ACOUSTIC_SR = 22050
+
+# Acoustic repetitions (t-t-t-t) = cluster of rapid onsets
+BURST_MIN_GAP_MS = 80.0      # Onsets 80-250ms apart = likely repetition
+BURST_MAX_GAP_MS = 250.0
+MIN_BURSTS = 4               # Need at least 4 bursts in a cluster
+
+# Consonants commonly prolonged in stuttering (fricatives, liquids, nasals)
+# 'sh' words are covered by 's'
+PROLONGABLE_CONSONANTS = frozenset('sfrlmnvz')
+
+# Two-letter onsets reported as the repeated sound in acoustic repetitions
+CONSONANT_CLUSTERS = frozenset(['st', 'sl', 'sp', 'sk', 'sc', 'tr', 'dr', 'br', 'cr', 'fr', 'gr', 'pr', 'bl', 'cl', 'fl', 'gl', 'pl'])
+
+# Decoded audio is cached here (opt-in, see load_audio), keyed by a hash of the file contents
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "stutter_cache")
+CACHE_MAX_FILES = int(os.getenv("STUTTER_CACHE_MAX_FILES", "64"))  # Least recently used beyond this are removed
+
+
+# ============== LAZY IMPORTS ==============
+# librosa pulls in numba/scipy/soundfile/audioread (~1-2s cold start), so load on first use
+@functools.lru_cache(maxsize=None)
+def _get_librosa():
+    import librosa
+    return librosa
+
+
+@functools.lru_cache(maxsize=None)
+def _get_soundfile():
+    import soundfile
+    return soundfile
+
 
 # ============== AUDIO & TRANSCRIPTION ==============
-def convert_to_wav(file_path):
-    """Convert MP3 to WAV if needed"""
-    if file_path.lower().endswith(".mp3"):
-        wav_path = file_path[:-4] + ".wav"
-        # Always regenerate WAV to ensure fresh audio
-        if os.path.exists(wav_path):
-            os.remove(wav_path)
-        print(f"Converting {file_path} to WAV...")
-        AudioSegment.from_mp3(file_path).export(wav_path, format="wav")
-        return wav_path
-    return file_path
-
-
-def transcribe_words(audio_path):
-    """Get word-level transcription with timestamps"""
+def _file_hash(file_path):
+    """Content hash used as the audio cache key"""
+    with open(file_path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def transcribe_words(audio, sr=WHISPER_SR):
+    """
+    Get word-level transcription with timestamps
+    audio: file path, or float32 samples at sr (resampled to 16kHz for Whisper)
+    """
+    if not isinstance(audio, str):
+        audio = resample(audio, sr, WHISPER_SR)
     print(f"Transcribing audio with Whisper ({WHISPER_MODEL} model)...")
-    model = WhisperModel(WHISPER_MODEL, device="cpu", compute_type="int8")
-    segments, _ = model.transcribe(audio_path, word_timestamps=True)
+    model = get_model(WHISPER_MODEL, "cpu", "int8")
+    # vad_filter skips silence before decoding (timestamps stay on the original timeline)
+    # condition_on_previous_text=False stops repeated words being "corrected" away or hallucinated
+    segments, _ = model.transcribe(
+        audio,
+        word_timestamps=True,
+        vad_filter=True,
+        condition_on_previous_text=False
+    )
     
+    words = _segments_to_words(segments)
+    print(f"✓ Transcribed {len(words)} words")
+    return words
+
+
+def _segments_to_words(segments):
+    """Flatten Whisper segments into [{'word', 'start', 'end'}, ...]"""
     words = []
     for segment in segments:
         if segment.words:
@@ -49,97 +100,156 @@ def transcribe_words(audio_path):
                     'start': w.start,
                     'end': w.end
                 })
-    
-    print(f"✓ Transcribed {len(words)} words")
     return words
 
 
-def load_audio(audio_path, sr=22050):
-    """Load audio file"""
-    y, sr = librosa.load(audio_path, sr=sr)
+def resample(y, orig_sr, target_sr):
+    """Resample float32 samples (no-op when the rates already match)"""
+    if orig_sr == target_sr:
+        return y
+    librosa = _get_librosa()
+    return librosa.resample(np.asarray(y, dtype=np.float32), orig_sr=orig_sr, target_sr=target_sr, res_type='soxr_hq')
+
+
+def _prune_cache():
+    """Remove the least recently used cache entries beyond CACHE_MAX_FILES"""
+    entries = [e for e in os.scandir(CACHE_DIR) if e.name.endswith('.npy')]
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[:max(0, len(entries) - CACHE_MAX_FILES)]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def load_audio(audio_path, sr=ACOUSTIC_SR, cache=False):
+    """
+    Decode audio file (MP3/WAV/...) straight to mono float32 samples
+    22.05kHz by default for onset detection; transcribe_words resamples to 16kHz
+    cache=True keeps the resampled samples on disk, keyed by file content
+    (for re-running the same clips, e.g. test_all_audios.py - one-off uploads never hit)
+    """
+    librosa, sf = _get_librosa(), _get_soundfile()
+    if cache:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        npy_path = os.path.join(CACHE_DIR, f"{_file_hash(audio_path)}_{sr}.npy")
+        try:
+            os.utime(npy_path)  # Mark as recently used
+            return np.load(npy_path, mmap_mode='r'), sr
+        except FileNotFoundError:
+            pass
+    
+    try:
+        # libsndfile decodes WAV/MP3/FLAC/OGG directly into a NumPy buffer
+        y, native_sr = sf.read(audio_path, dtype='float32', always_2d=False)
+        if y.ndim > 1:
+            y = y.mean(axis=1, dtype=np.float32)
+        if native_sr != sr:
+            y = librosa.resample(y, orig_sr=native_sr, target_sr=sr, res_type='soxr_hq')
+    except sf.LibsndfileError:
+        # Containers libsndfile can't read (e.g. webm) go through librosa's ffmpeg fallback
+        y, sr = librosa.load(audio_path, sr=sr, mono=True, res_type='soxr_hq')
+    # Keep the whole pipeline float32 (half the memory traffic of float64)
+    y = y.astype(np.float32, copy=False)
+    
+    if cache:
+        tmp_path = npy_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, y)
+        os.replace(tmp_path, npy_path)
+        _prune_cache()
     return y, sr
 
 
 # ============== DETECTION (SUPER SIMPLE!) ==============
-def detect_blocks(words):
+# Strips punctuation/whitespace when comparing words (compiled once)
+_NON_WORD_RE = re.compile(r'\W+')
+
+
+def clean_word(word):
+    """Lowercase word with punctuation and whitespace removed"""
+    return _NON_WORD_RE.sub('', word.lower())
+
+
+def word_times(words):
+    """
+    Word start/end times as float64 arrays, plus the pause before each word
+    gaps[i-1] = pause between words[i-1] and words[i]
+    Computed once in detect_all and shared by the detectors
+    """
+    starts = np.fromiter((w['start'] for w in words), dtype=np.float64, count=len(words))
+    ends = np.fromiter((w['end'] for w in words), dtype=np.float64, count=len(words))
+    gaps = starts[1:] - ends[:-1]
+    return starts, ends, gaps
+
+
+def detect_blocks(words, starts, gaps):
     """
     Block = long pause (1.5+ seconds) between words
     """
     events = []
     
-    for i in range(1, len(words)):
-        prev_word = words[i-1]
+    # Simple check: gap >= BLOCK_GAP_SECONDS
+    mask = (gaps >= BLOCK_GAP_SECONDS) & (starts[1:] >= IGNORE_FIRST_SECONDS)
+    
+    # Skip blocks involving the first word (it includes leading silence)
+    if len(mask) and starts[0] < 0.1:
+        mask[0] = False
+    
+    for i in np.flatnonzero(mask) + 1:
         curr_word = words[i]
-        
-        gap = curr_word['start'] - prev_word['end']
-        
-        # Skip blocks involving the first word (it includes leading silence)
-        if i == 1 and prev_word['start'] < 0.1:
-            continue
-        
-        # Simple check: gap >= BLOCK_GAP_SECONDS
-        if gap >= BLOCK_GAP_SECONDS and curr_word['start'] >= IGNORE_FIRST_SECONDS:
-            events.append({
-                "type": "block",
-                "word": curr_word['word'],
-                "start": curr_word['start'],
-                "end": curr_word['end'],
-                "gap_duration": gap,
-                "confidence": 0.85
-            })
+        events.append({
+            "type": "block",
+            "word": curr_word['word'],
+            "start": curr_word['start'],
+            "end": curr_word['end'],
+            "gap_duration": float(gaps[i-1]),
+            "confidence": 0.85
+        })
     
     return events
 
 
-def detect_repetitions(words):
+def detect_repetitions(words, clean_words):
     """
     Repetition = same word 3+ times in a row (4+ for single letters)
     """
     events = []
-    i = 0
     
-    while i < len(words):
-        # Clean the word (remove punctuation)
-        word = re.sub(r'\W+', '', words[i]['word'].lower())
-        
+    # Each group is one run of the same cleaned word: (word, its indices)
+    for word, run in itertools.groupby(range(len(clean_words)), key=clean_words.__getitem__):
         if len(word) < 1:
-            i += 1
             continue
         
-        # Count consecutive repetitions
-        start_idx = i
-        while i + 1 < len(words) and re.sub(r'\W+', '', words[i+1]['word'].lower()) == word:
-            i += 1
-        end_idx = i
-        
-        count = end_idx - start_idx + 1
+        run = list(run)
+        start_idx, end_idx = run[0], run[-1]
+        count = len(run)
         
         # Check if we have enough repetitions
-        if count >= MIN_REPETITIONS:
-            # NOTE: We DON'T skip first word for repetitions!
-            # If someone repeats a word 4 times starting at 0.0s, that's a real stutter,
-            # not just leading silence. Leading silence only matters for prolongations.
-            
-            # Single letters need 4+ reps (unless it's "i")
-            if len(word) == 1 and word not in ['i'] and count < MIN_SINGLE_LETTER_REPS:
-                i += 1
-                continue
-            
-            events.append({
-                "type": "repetition",
-                "word": word,
-                "count": count,
-                "start": words[start_idx]['start'],
-                "end": words[end_idx]['end'],
-                "confidence": 0.95
-            })
+        if count < MIN_REPETITIONS:
+            continue
+        
+        # NOTE: We DON'T skip first word for repetitions!
+        # If someone repeats a word 4 times starting at 0.0s, that's a real stutter,
+        # not just leading silence. Leading silence only matters for prolongations.
+        
+        # Single letters need 4+ reps (unless it's "i")
+        if len(word) == 1 and word not in ['i'] and count < MIN_SINGLE_LETTER_REPS:
+            continue
         
-        i += 1
+        events.append({
+            "type": "repetition",
+            "word": word,
+            "count": count,
+            "start": words[start_idx]['start'],
+            "end": words[end_idx]['end'],
+            "confidence": 0.95
+        })
     
     return events
 
 
-def detect_prolongations(words):
+def detect_prolongations(words, clean_words, starts, ends, gaps):
     """
     Prolongation = word duration >= threshold
     Simple! No complex F0 or RMS checks.
@@ -147,45 +257,91 @@ def detect_prolongations(words):
     """
     events = []
     
-    # Consonants commonly prolonged in stuttering (fricatives, liquids, nasals)
-    PROLONGABLE_CONSONANTS = ['s', 'f', 'r', 'l', 'm', 'n', 'v', 'z', 'sh']
+    durations = ends - starts
     
-    for idx, w in enumerate(words):
-        duration = w['end'] - w['start']
-        word_clean = w['word'].strip().lower().strip('.,!?;:\'"')
-        
-        # Check if there's a gap BEFORE this word (indicates it might be a block, not prolongation)
-        # If so, skip it - this should be detected as a block, not a prolongation
-        if idx > 0:
-            gap_before = w['start'] - words[idx-1]['end']
-            if gap_before >= BLOCK_GAP_SECONDS:
-                continue
-        
-        # Check if word starts with a prolongable consonant (use lower threshold)
-        starts_with_prolongable = any(word_clean.startswith(c) for c in PROLONGABLE_CONSONANTS)
+    # Check if word starts with a prolongable consonant (use lower threshold)
+    starts_with_prolongable = np.fromiter(
+        (word[:1] in PROLONGABLE_CONSONANTS for word in clean_words),
+        dtype=bool, count=len(words)
+    )
+    
+    # Use lower threshold for prolongable consonants, higher for others
+    thresholds = np.where(starts_with_prolongable, PROLONGATION_CONSONANT, PROLONGATION_SECONDS)
+    
+    # Check if there's a gap BEFORE this word (indicates it might be a block, not prolongation)
+    # If so, skip it - this should be detected as a block, not a prolongation
+    gap_before = np.concatenate(([0.0], gaps))
+    
+    hits = np.flatnonzero((durations >= thresholds) & (gap_before < BLOCK_GAP_SECONDS))
+    
+    for idx in hits:
+        w = words[idx]
+        events.append({
+            "type": "prolongation",
+            "word": w['word'],
+            "start": w['start'],
+            "end": w['end'],
+            "dur_ms": float(durations[idx]) * 1000,
+            "confidence": 0.85
+        })
+    
+    return events
+
+
+def _cluster_bursts(onset_times_ms, min_gap, max_gap, min_bursts):
+    """
+    Scan onset times (ms) for clusters of rapid bursts.
+    Returns (cluster_starts, cluster_ends, burst_counts) as onset indices.
+    """
+    n = len(onset_times_ms)
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    counts = np.empty(n, dtype=np.int64)
+    k = 0
+    
+    i = 0
+    while i < n - (min_bursts - 1):
+        burst_count = 1
         
-        # Use lower threshold for prolongable consonants, higher for others
-        threshold = PROLONGATION_CONSONANT if starts_with_prolongable else PROLONGATION_SECONDS
+        # Look at most 10 gaps ahead
+        for j in range(i, min(i + 10, n - 1)):
+            gap_ms = onset_times_ms[j + 1] - onset_times_ms[j]
+            if min_gap <= gap_ms <= max_gap:
+                burst_count += 1
+            else:
+                break
         
-        if duration >= threshold:
-            events.append({
-                "type": "prolongation",
-                "word": w['word'],
-                "start": w['start'],
-                "end": w['end'],
-                "dur_ms": duration * 1000,
-                "confidence": 0.85
-            })
+        if burst_count >= min_bursts:
+            starts[k] = i
+            ends[k] = i + burst_count - 1
+            counts[k] = burst_count
+            k += 1
+            i += burst_count
+        else:
+            i += 1
     
-    return events
+    return starts[:k], ends[:k], counts[:k]
 
 
-def detect_acoustic_repetitions(y, sr, words):
+@functools.lru_cache(maxsize=None)
+def _get_cluster_kernel():
+    """JIT-compile _cluster_bursts on first use (compiled code is cached on disk)"""
+    from numba import njit
+    return njit(cache=True)(_cluster_bursts)
+
+
+def detect_acoustic_repetitions(y, sr, words, clean_words, starts):
     """
     Acoustic repetition = rapid sound bursts (t-t-t-t)
     Uses onset detection to catch what Whisper misses
     """
     events = []
+    librosa = _get_librosa()
+    
+    # Callers may hand in float64 samples - narrow once so the onset envelope stays float32
+    y = np.asarray(y, dtype=np.float32)
+    # Onset thresholds were tuned on 22.05kHz audio (23ms frames)
+    y, sr = resample(y, sr, ACOUSTIC_SR), ACOUSTIC_SR
     
     try:
         # Detect onsets (sudden energy bursts)
@@ -196,71 +352,54 @@ def detect_acoustic_repetitions(y, sr, words):
             delta=0.15  # Very high threshold - only extremely clear repetitions
         )
         
-        if len(onset_frames) < 4:
+        if len(onset_frames) < MIN_BURSTS:
             return events
         
         # Convert to time
         onset_times = librosa.frames_to_time(onset_frames, sr=sr, hop_length=512)
         
         # Look for clusters of rapid onsets
-        i = 0
-        while i < len(onset_times) - 3:
-            # Check for bursts
-            cluster_start = i
-            burst_count = 1
+        cluster_starts, cluster_ends, burst_counts = _get_cluster_kernel()(
+            onset_times * 1000, BURST_MIN_GAP_MS, BURST_MAX_GAP_MS, MIN_BURSTS
+        )
+        
+        for cluster_start, cluster_end, burst_count in zip(cluster_starts, cluster_ends, burst_counts):
+            start_time = onset_times[cluster_start]
+            end_time = onset_times[cluster_end]
+            
+            # Skip if too early
+            if start_time < IGNORE_FIRST_SECONDS:
+                continue
             
-            for j in range(i, min(i + 10, len(onset_times) - 1)):
-                gap_ms = (onset_times[j + 1] - onset_times[j]) * 1000
-                
-                # Gap between 80-250ms = likely repetition (expanded range)
-                if 80 <= gap_ms <= 250:
-                    burst_count += 1
-                else:
-                    break
+            # Try to figure out what sound is being repeated
+            inferred_sound = None
+            target_word = None
             
-            # Need at least 4 bursts (lowered from 5)
-            if burst_count >= 4:
-                start_time = onset_times[cluster_start]
-                end_time = onset_times[cluster_start + burst_count - 1]
-                
-                # Skip if too early
-                if start_time >= IGNORE_FIRST_SECONDS:
-                    # Try to figure out what sound is being repeated
-                    inferred_sound = None
-                    target_word = None
-                    
-                    # Find next word after this cluster (within 0.8s)
-                    for w in words:
-                        if w['start'] >= end_time and (w['start'] - end_time) < 0.8:
-                            word_text = w['word'].strip('.,!?;:\'" \t\n\r').lower()
-                            if word_text and len(word_text) > 0:
-                                # Check for consonant clusters first (st, sl, tr, etc.)
-                                consonant_clusters = ['st', 'sl', 'sp', 'sk', 'sc', 'tr', 'dr', 'br', 'cr', 'fr', 'gr', 'pr', 'bl', 'cl', 'fl', 'gl', 'pl']
-                                if len(word_text) >= 2 and word_text[:2] in consonant_clusters:
-                                    inferred_sound = word_text[:2]
-                                else:
-                                    inferred_sound = word_text[0]
-                                target_word = w['word']
-                            break
-                    
-                    # If we still couldn't infer, OR if it's just whitespace/punctuation, skip this detection
-                    if not inferred_sound or not target_word or not inferred_sound.strip() or len(inferred_sound.strip()) == 0:
-                        i += burst_count
-                        continue
-                    events.append({
-                        "type": "acoustic_repetition",
-                        "word": inferred_sound,  # Just the sound for frontend
-                        "inferred_sound": inferred_sound,
-                        "target_word": target_word,
-                        "count": burst_count,
-                        "start": start_time,
-                        "end": end_time,
-                        "confidence": 0.80
-                    })
-                
-                i += burst_count
-            else:
-                i += 1
+            # Find next word after this cluster (within 0.8s) - binary search on word starts
+            j = int(np.searchsorted(starts, end_time, side='left'))
+            if j < len(words) and (starts[j] - end_time) < 0.8:
+                word_text = clean_words[j]
+                if word_text and len(word_text) > 0:
+                    # Check for consonant clusters first (st, sl, tr, etc.)
+                    if len(word_text) >= 2 and word_text[:2] in CONSONANT_CLUSTERS:
+                        inferred_sound = word_text[:2]
+                    else:
+                        inferred_sound = word_text[0]
+                    target_word = words[j]['word']
+            
+            # If we still couldn't infer, OR if it's just whitespace/punctuation, skip this detection
+            if not inferred_sound or not target_word or not inferred_sound.strip() or len(inferred_sound.strip()) == 0:
+                continue
+            events.append({
+                "type": "acoustic_repetition",
+                "word": inferred_sound,  # Just the sound for frontend
+                "inferred_sound": inferred_sound,
+                "target_word": target_word,
+                "count": int(burst_count),
+                "start": float(start_time),
+                "end": float(end_time),
+                "confidence": 0.80
+            })
     
     except Exception as e:
         print(f"Warning: Acoustic detection error: {e}")
@@ -269,31 +408,49 @@ def detect_acoustic_repetitions(y, sr, words):
 
 
 # ============== MAIN DETECTION ==============
-def detect_all(audio_file, verbose=True):
+def detect_all(audio_file, verbose=True, words=None, y=None, sr=None):
     """
     Detect all stutter types - simple and clean!
+    Pass words and/or y, sr to reuse an existing transcription / decoded audio
     """
-    # Convert and load
-    wav_file = convert_to_wav(audio_file)
-    words = transcribe_words(wav_file)
-    y, sr = load_audio(wav_file)
+    # Decode once, then share the samples between Whisper and librosa
+    if y is None:
+        y, sr = load_audio(audio_file)
+    if words is None:
+        words = transcribe_words(y, sr)
     
     if len(words) < 2:
         return {'events': [], 'words': words}
     
     print("Analyzing acoustic features...")
     
+    # Shared per-word data: cleaned text and timing arrays (computed once)
+    clean_words = [clean_word(w['word']) for w in words]
+    starts, ends, gaps = word_times(words)
+    
+    # Cheap early-outs: skip detectors that can't possibly fire
+    run_blocks = gaps.max() >= BLOCK_GAP_SECONDS
+    run_repetitions = len(words) >= MIN_REPETITIONS
+    run_prolongations = (ends - starts).max() >= min(PROLONGATION_CONSONANT, PROLONGATION_SECONDS)
+    run_acoustic = y.size >= sr * 0.5  # Too short for a burst cluster
+    
     # Detect each type (all independent, simple checks)
-    blocks = detect_blocks(words)
-    repetitions = detect_repetitions(words)
-    prolongations = detect_prolongations(words)
-    acoustic_reps = detect_acoustic_repetitions(y, sr, words)
+    # Run them side by side - librosa's onset detection releases the GIL
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        f_rep = ex.submit(detect_repetitions, words, clean_words) if run_repetitions else None
+        f_pro = ex.submit(detect_prolongations, words, clean_words, starts, ends, gaps) if run_prolongations else None
+        f_aco = ex.submit(detect_acoustic_repetitions, y, sr, words, clean_words, starts) if run_acoustic else None
+        blocks = detect_blocks(words, starts, gaps) if run_blocks else []
+        repetitions = f_rep.result() if f_rep else []
+        prolongations = f_pro.result() if f_pro else []
+        acoustic_reps = f_aco.result() if f_aco else []
     
     # Combine all events
     all_events = blocks + repetitions + prolongations + acoustic_reps
     
-    # Sort by time
-    all_events.sort(key=lambda x: x['start'])
+    # Sort by time (one stable argsort over the start times, no per-element key calls)
+    event_starts = np.fromiter((e['start'] for e in all_events), dtype=np.float64, count=len(all_events))
+    all_events = [all_events[i] for i in np.argsort(event_starts, kind='stable')]
     
     if verbose:
         print(f"\n🗣️  TRANSCRIPTION: '{' '.join([w['word'] for w in words])}'")
@@ -1,20 +1,22 @@
 # server.py
-import os, sys, tempfile, shutil, subprocess, uuid, mimetypes, traceback
+import os, sys, re, tempfile, shutil, subprocess, uuid, mimetypes, traceback, hashlib, threading, functools, json, time, importlib.util
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 from dotenv import load_dotenv
 
 # === your imports from the script ===
-import whisper
 from google import genai
+import httpx
 from elevenlabs.client import ElevenLabs
 from voice_cloner import VoiceCloner
 
 # === stutter detection imports ===
-from pydub import AudioSegment
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent / 'detection-Files'))
-from stutter_detector import detect_all
+import asr_cache
+from stutter_detector import ACOUSTIC_SR, detect_all
 from practice_generator import PracticeGenerator
 from generate_audio import generate_practice_audio
 from speech_therapy_tips import SpeechTherapyAdvisor
@@ -26,6 +28,17 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 PORT = int(os.getenv("PORT", "5001"))
 
 WHISPER_MODEL = "base"     # tiny/base/small/medium/large
+# faster-whisper (CTranslate2): fp16 activations on GPU, int8 weights everywhere
+try:
+    import ctranslate2
+    WHISPER_DEVICE = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+except Exception:
+    WHISPER_DEVICE = "cpu"
+WHISPER_COMPUTE_TYPE = "int8_float16" if WHISPER_DEVICE == "cuda" else "int8"
+# "hf": HuggingFace pipeline in bf16 (+ FlashAttention 2 if installed) on CUDA; falls back to faster-whisper
+# "whispercpp": whisper.cpp quantized ggml model on CPU-only hosts; falls back to faster-whisper
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "faster-whisper")
+WHISPERCPP_MODEL = os.getenv("WHISPERCPP_MODEL", f"{WHISPER_MODEL}-q5_1")
 CLEAN_MODE = "fluency"     # "fluency" or "grammar"
 USE_LIPSYNC_DEFAULT = True
 
@@ -34,16 +47,55 @@ W2L_REPO_DIR = os.path.join(PROJECT_DIR, "vendor", "wav2lip-onnx")
 W2L_INFER    = os.path.join(W2L_REPO_DIR, "inference_onnxModel.py")
 W2L_MODEL    = os.path.join(W2L_REPO_DIR, "checkpoints", "wav2lip.onnx")
 
+# API clients are built once so their HTTP connection pools are reused across requests
+GEMINI_CLIENT = genai.Client(api_key=GEMINI_API_KEY) if GEMINI_API_KEY else None
+def _make_elevenlabs_http_client():
+    # HTTP/2 multiplexes concurrent TTS streams over one connection (needs the h2 package)
+    http2 = importlib.util.find_spec("h2") is not None
+    # follow_redirects=True matches the client the ElevenLabs SDK builds by default
+    return httpx.Client(http2=http2, limits=httpx.Limits(max_keepalive_connections=8),
+                        timeout=240, follow_redirects=True)
+
+ELEVENLABS_CLIENT = (ElevenLabs(api_key=ELEVENLABS_API_KEY, httpx_client=_make_elevenlabs_http_client())
+                     if ELEVENLABS_API_KEY else None)
+VOICE_CLONER = VoiceCloner(ELEVENLABS_API_KEY)
+
 OUTPUT_DIR = os.path.join(PROJECT_DIR, "outputs")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Server-side caches; kept out of OUTPUT_DIR because /files/ serves that publicly
+CACHE_DIR = os.path.join(PROJECT_DIR, "cache")
+os.makedirs(CACHE_DIR, exist_ok=True)
+# Per-request intermediates (WAVs) go to RAM-backed tmpfs when it has room
+# (Docker's default /dev/shm is only 64MB, so check free space instead of just existence)
+TMP_SHM_MIN_FREE_MB = int(os.getenv("TMP_SHM_MIN_FREE_MB", "512"))
+
+TTS_MODEL_ID = "eleven_multilingual_v2"
+TTS_OUTPUT_FORMAT = "mp3_44100_128"
+TTS_CACHE_DIR = os.path.join(CACHE_DIR, "tts")
+TTS_CACHE_MAX_ENTRIES = int(os.getenv("TTS_CACHE_MAX_ENTRIES", "64"))
+# Stream Gemini's output sentence by sentence into ElevenLabs' WebSocket TTS (needs `websockets`)
+STREAM_TTS = os.getenv("STREAM_TTS", "0") == "1"
+os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+VOICE_CACHE_PATH = os.path.join(CACHE_DIR, "voice_cache.json")
 
 # === stutter detection folders ===
 UPLOAD_FOLDER = os.path.join(PROJECT_DIR, "temp_uploads")
 STUTTER_OUTPUT_FOLDER = os.path.join(PROJECT_DIR, "detection-Files", "outputFiles")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+UPLOAD_BUFFER_SIZE = 1 << 20  # copy uploads to disk in 1MB chunks (werkzeug default is 16KB)
 os.makedirs(STUTTER_OUTPUT_FOLDER, exist_ok=True)
 
 # ================== HELPERS ==================
+def tmp_root():
+    """/dev/shm if it is writable with TMP_SHM_MIN_FREE_MB free, else None (the default temp dir)"""
+    try:
+        st = os.statvfs("/dev/shm")
+    except (OSError, AttributeError):  # no /dev/shm, or no statvfs (Windows)
+        return None
+    if not os.access("/dev/shm", os.W_OK) or st.f_bavail * st.f_frsize < TMP_SHM_MIN_FREE_MB << 20:
+        return None
+    return "/dev/shm"
+
 def run(cmd):
     print("▶", " ".join(str(x) for x in cmd))
     p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
@@ -59,8 +111,11 @@ def need_ffmpeg():
     except Exception:
         raise RuntimeError("❌ ffmpeg/ffprobe not found. Install ffmpeg.")
 
-def extract_for_asr(src_path, wav16k_mono):
-    run(["ffmpeg","-y","-i", src_path, "-vn", "-ac","1", "-ar","16000", wav16k_mono])
+def extract_asr_and_reference(src_path, wav16k_mono, ref_wav44k):
+    # One decode, two outputs: 16k mono for Whisper and 44.1k mono as the cloning reference
+    run(["ffmpeg","-y","-i", src_path, "-vn",
+         "-map","0:a", "-ac","1", "-ar","16000", wav16k_mono,
+         "-map","0:a", "-ac","1", "-ar","44100", ref_wav44k])
 
 def convert_to(src_path, dst_path, ar=None, ac=None):
     # Force audio-only conversion to avoid container quirks
@@ -70,17 +125,92 @@ def convert_to(src_path, dst_path, ar=None, ac=None):
     cmd += [dst_path]
     run(cmd)
 
+@functools.lru_cache(maxsize=1)
+def _use_hf_whisper():
+    if WHISPER_BACKEND != "hf":
+        return False
+    if importlib.util.find_spec("torch") is None or importlib.util.find_spec("transformers") is None:
+        print("⚠️  WHISPER_BACKEND=hf needs torch + transformers; using faster-whisper")
+        return False
+    import torch
+    return torch.cuda.is_available()
+
+_hf_whisper_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=2)
+def _load_hf_whisper(model_name):
+    import torch
+    from transformers import pipeline
+    attn = "flash_attention_2" if importlib.util.find_spec("flash_attn") is not None else "sdpa"
+    return pipeline(
+        "automatic-speech-recognition",
+        model=f"openai/whisper-{model_name}",
+        torch_dtype=torch.bfloat16,
+        device="cuda",
+        model_kwargs={"attn_implementation": attn},
+    )
+
+def _get_hf_whisper(model_name):
+    with _hf_whisper_lock:
+        return _load_hf_whisper(model_name)
+
+@functools.lru_cache(maxsize=1)
+def _use_whispercpp():
+    if WHISPER_BACKEND != "whispercpp" or WHISPER_DEVICE != "cpu":
+        return False
+    if importlib.util.find_spec("pywhispercpp") is None:
+        print("⚠️  WHISPER_BACKEND=whispercpp needs pywhispercpp; using faster-whisper")
+        return False
+    return True
+
+# whisper.cpp contexts aren't safe to share between concurrent calls
+_whispercpp_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=2)
+def _load_whispercpp(model_name):
+    from pywhispercpp.model import Model
+    return Model(model_name, n_threads=os.cpu_count() or 4)
+
+def warm_whisper(model_name=WHISPER_MODEL):
+    """Load the Whisper model (and batched pipeline on GPU) into the shared cache ahead of use"""
+    if _use_hf_whisper():
+        _get_hf_whisper(model_name)
+    elif _use_whispercpp():
+        with _whispercpp_lock:
+            _load_whispercpp(WHISPERCPP_MODEL)
+    elif WHISPER_DEVICE == "cuda":
+        asr_cache.get_batched_pipeline(model_name, WHISPER_DEVICE, WHISPER_COMPUTE_TYPE)
+    else:
+        asr_cache.get_model(model_name, WHISPER_DEVICE, WHISPER_COMPUTE_TYPE)
+
 def transcribe_whisper(wav16k, model_name=WHISPER_MODEL):
     print("📝 Transcribing…")
-    model = whisper.load_model(model_name)
-    res = model.transcribe(wav16k, fp16=False)
-    return res["text"].strip()
+    if _use_hf_whisper():
+        # Overlapping 30s chunks (5s stride each side) decoded 8 at a time in bf16;
+        # the pipeline stitches the overlaps back together
+        res = _get_hf_whisper(model_name)(wav16k, chunk_length_s=30, stride_length_s=(5, 5),
+                                          batch_size=8, return_timestamps=False)
+        return res["text"].strip()
+    if _use_whispercpp():
+        # Quantized ggml weights with hand-tuned SIMD kernels (uses WHISPERCPP_MODEL)
+        with _whispercpp_lock:
+            segments = _load_whispercpp(WHISPERCPP_MODEL).transcribe(wav16k)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+    # Model is loaded once per process by asr_cache and reused across requests
+    # On GPU, decode the VAD chunks as one batch instead of sequential 30s windows
+    batch_size = 8 if WHISPER_DEVICE == "cuda" else None
+    # VAD drops silences of 0.5s+ before decoding, so quiet stretches cost no encoder time
+    return asr_cache.transcribe(wav16k, model_size=model_name, device=WHISPER_DEVICE,
+                                compute_type=WHISPER_COMPUTE_TYPE, batch_size=batch_size, beam_size=5,
+                                vad_filter=True, vad_parameters={"min_silence_duration_ms": 500})
 
 def clean_text_with_gemini(raw_text, mode=CLEAN_MODE):
     print("🧼 Cleaning text…")
-    if not GEMINI_API_KEY:
+    if GEMINI_CLIENT is None:
         return raw_text.strip()
-    client = genai.Client(api_key=GEMINI_API_KEY)
+    return _clean_text_cached(raw_text.strip(), mode)
+
+def _cleaning_prompt(raw_text, mode):
     if mode == "fluency":
         prompt = (
             "You are cleaning a transcript for fluent re-synthesis.\n"
@@ -93,24 +223,249 @@ def clean_text_with_gemini(raw_text, mode=CLEAN_MODE):
         )
     else:
         prompt = "Fix grammar and clarity. Output only corrected text.\n\n" + raw_text
-    resp = client.models.generate_content(model="gemini-2.5-flash", contents=prompt)
+    return prompt
+
+# Identical transcripts (retries, demo clips) skip the Gemini round trip
+@functools.lru_cache(maxsize=1024)
+def _clean_text_cached(raw_text, mode):
+    prompt = _cleaning_prompt(raw_text, mode)
+    resp = GEMINI_CLIENT.models.generate_content(model="gemini-2.5-flash", contents=prompt)
     cleaned = (resp.text or "").strip()
     return cleaned if cleaned else raw_text.strip()
 
-def elevenlabs_tts_to_mp3(text, out_mp3, voice_id):
+# A sentence ends at . ! or ? followed by whitespace
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+MIN_SENTENCE_CHARS = 10
+
+def stream_clean_sentences(raw_text, mode=CLEAN_MODE, parts=None):
+    """
+    Like clean_text_with_gemini, but yields the cleaned text sentence by sentence as
+    Gemini generates it. Every yielded piece is also appended to parts (if given).
+    """
+    print("🧼 Cleaning text (streaming)…")
+    raw_text = raw_text.strip()
+
+    def emit(text):
+        if parts is not None:
+            parts.append(text)
+        return text
+
+    if GEMINI_CLIENT is None:
+        yield emit(raw_text)
+        return
+
+    buffer = ""
+    emitted = False
+    prompt = _cleaning_prompt(raw_text, mode)
+    for chunk in GEMINI_CLIENT.models.generate_content_stream(model="gemini-2.5-flash", contents=prompt):
+        buffer += chunk.text or ""
+        # Flush complete sentences; keep the trailing partial one buffered
+        pieces = _SENTENCE_END_RE.split(buffer)
+        buffer = pieces.pop()
+        sentence = ""
+        for piece in pieces:
+            sentence += piece + " "
+            if len(sentence.strip()) >= MIN_SENTENCE_CHARS:
+                emitted = True
+                yield emit(sentence)
+                sentence = ""
+        buffer = sentence + buffer
+    if buffer.strip():
+        emitted = True
+        yield emit(buffer.strip())
+    if not emitted:
+        # Same fallback as clean_text_with_gemini: an empty response keeps the transcript
+        yield emit(raw_text)
+
+def elevenlabs_tts_to_mp3(text, out_mp3, voice_id, out_wav=None):
+    """
+    Stream ElevenLabs TTS into out_mp3. If out_wav is given, the same bytes are piped
+    into ffmpeg as they arrive, so the 44.1kHz stereo WAV is ready when the stream ends
+    """
     print("🔊 Generating TTS…")
-    if not ELEVENLABS_API_KEY:
+    if ELEVENLABS_CLIENT is None:
         raise RuntimeError("No ELEVENLABS_API_KEY in .env")
-    client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
-    stream = client.text_to_speech.convert(
+    stream = ELEVENLABS_CLIENT.text_to_speech.convert(
         text=text,
         voice_id=voice_id,
-        model_id="eleven_multilingual_v2",
-        output_format="mp3_44100_128",
+        model_id=TTS_MODEL_ID,
+        output_format=TTS_OUTPUT_FORMAT,
+    )
+    write_tts_stream(stream, out_mp3, out_wav)
+
+def elevenlabs_stream_tts_to_mp3(text_iter, out_mp3, voice_id, out_wav=None):
+    """
+    WebSocket input-streaming TTS: synthesis starts on the first sentence of text_iter
+    instead of waiting for the whole text. Output handling matches elevenlabs_tts_to_mp3.
+    """
+    print("🔊 Generating TTS (streaming input)…")
+    if ELEVENLABS_CLIENT is None:
+        raise RuntimeError("No ELEVENLABS_API_KEY in .env")
+    stream = ELEVENLABS_CLIENT.text_to_speech.convert_realtime(
+        voice_id=voice_id,
+        text=text_iter,
+        model_id=TTS_MODEL_ID,
+        output_format=TTS_OUTPUT_FORMAT,
     )
-    with open(out_mp3, "wb") as f:
-        for chunk in stream:
-            f.write(chunk)
+    write_tts_stream(stream, out_mp3, out_wav)
+
+def write_tts_stream(stream, out_mp3, out_wav=None):
+    """Write MP3 chunks to out_mp3, also piping them into ffmpeg for out_wav if given"""
+    proc = log = None
+    if out_wav:
+        cmd = ["ffmpeg","-y","-f","mp3","-i","-","-ac","2","-ar","44100", out_wav]
+        print("▶", " ".join(cmd))
+        # ffmpeg's log goes to a temp file, not a pipe: an unread stderr pipe can fill up and stall stdin
+        log = tempfile.TemporaryFile()
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                stderr=log, bufsize=1 << 20)
+    try:
+        try:
+            with open(out_mp3, "wb") as f:
+                for chunk in stream:
+                    f.write(chunk)
+                    if proc:
+                        proc.stdin.write(chunk)
+            if proc:
+                # close() flushes the pipe buffer, so it can hit an ffmpeg that already exited too
+                proc.stdin.close()
+                proc.wait()
+        except OSError as e:
+            if not proc:
+                raise
+            # BrokenPipeError means ffmpeg exited early (its log says why); otherwise stop it
+            if not isinstance(e, BrokenPipeError):
+                proc.kill()
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+            proc.wait()
+            _print_log(log)
+            raise RuntimeError("Command failed") from e
+        except Exception:
+            if proc:
+                proc.kill()
+                proc.wait()
+            raise
+        if proc and proc.returncode != 0:
+            _print_log(log)
+            raise RuntimeError("Command failed")
+    finally:
+        if log:
+            log.close()
+
+def _print_log(log):
+    log.seek(0)
+    print(log.read().decode(errors="replace"))
+
+# LRU of cached TTS files (key -> path), oldest first; seeded from disk on startup
+_tts_cache = OrderedDict(
+    (os.path.splitext(e.name)[0], e.path)
+    for e in sorted(os.scandir(TTS_CACHE_DIR), key=lambda e: e.stat().st_mtime)
+    if e.name.endswith(".mp3")
+)
+_tts_cache_lock = threading.Lock()
+
+def tts_cached(text, out_mp3, voice_id, out_wav=None):
+    """elevenlabs_tts_to_mp3, but identical (text, voice, model, format) requests are served from disk"""
+    key = hashlib.sha256(f"{voice_id}|{TTS_MODEL_ID}|{TTS_OUTPUT_FORMAT}|{text}".encode()).hexdigest()
+    with _tts_cache_lock:
+        cached = _tts_cache.get(key)
+        hit = bool(cached) and os.path.exists(cached)
+        if hit:
+            _tts_cache.move_to_end(key)
+    if hit:
+        try:
+            # The lock is released, so a concurrent eviction can delete the file under us
+            shutil.copyfile(cached, out_mp3)
+        except FileNotFoundError:
+            hit = False
+    if hit:
+        print("🔊 TTS cache hit")
+        if out_wav:
+            convert_to(out_mp3, out_wav, ar="44100", ac="2")
+        return
+
+    elevenlabs_tts_to_mp3(text, out_mp3, voice_id, out_wav)
+    # Copying into the cache isn't needed for this response - do it off the request thread
+    _cache_writer.submit(_store_tts_cache, key, out_mp3)
+
+# Single background thread for cache writes (keeps them ordered and off the request path)
+_cache_writer = ThreadPoolExecutor(max_workers=1)
+
+def _store_tts_cache(key, out_mp3):
+    cached = os.path.join(TTS_CACHE_DIR, f"{key}.mp3")
+    try:
+        shutil.copyfile(out_mp3, cached + ".tmp")
+        os.replace(cached + ".tmp", cached)
+    except OSError as e:
+        print(f"⚠️  Could not cache TTS audio: {e}")
+        return
+    with _tts_cache_lock:
+        _tts_cache[key] = cached
+        _tts_cache.move_to_end(key)
+        # Bound disk usage: drop least recently used entries
+        while len(_tts_cache) > TTS_CACHE_MAX_ENTRIES:
+            _, old_path = _tts_cache.popitem(last=False)
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+_voice_cache_lock = threading.Lock()
+
+def _audio_fingerprint(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _load_voice_cache():
+    try:
+        with open(VOICE_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_voice_cache(cache):
+    tmp_path = VOICE_CACHE_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, VOICE_CACHE_PATH)
+
+# Voices belong to an ElevenLabs account, so entries are scoped to (a hash of) the API key
+_VOICE_ACCOUNT = hashlib.sha256((ELEVENLABS_API_KEY or "").encode()).hexdigest()[:16]
+
+def clone_voice_cached(ref_audio, voice_name):
+    """Clone a voice from ref_audio, reusing the voice_id from an earlier identical upload"""
+    key = f"{_VOICE_ACCOUNT}:{_audio_fingerprint(ref_audio)}"
+    with _voice_cache_lock:
+        voice_id = _load_voice_cache().get(key)
+    if voice_id:
+        print("🗣️ Reusing cloned voice for identical reference audio")
+        return voice_id
+
+    voice_id = VOICE_CLONER.clone_voice(ref_audio, voice_name)
+    if voice_id:
+        with _voice_cache_lock:
+            cache = _load_voice_cache()
+            cache[key] = voice_id
+            _save_voice_cache(cache)
+    return voice_id
+
+def forget_cloned_voice(voice_id):
+    """Drop cache entries pointing at voice_id (e.g. it was deleted on ElevenLabs' side)"""
+    with _voice_cache_lock:
+        cache = _load_voice_cache()
+        kept = {k: v for k, v in cache.items() if v != voice_id}
+        if len(kept) != len(cache):
+            _save_voice_cache(kept)
+
+def _is_voice_not_found(e):
+    """ElevenLabs answers TTS for an unknown/deleted voice_id with 404 'voice_not_found'"""
+    return getattr(e, "status_code", None) == 404 or "voice_not_found" in str(e)
 
 def ensure_wav2lip_paths():
     if not os.path.exists(W2L_INFER):
@@ -118,6 +473,23 @@ def ensure_wav2lip_paths():
     if not os.path.exists(W2L_MODEL):
         raise RuntimeError(f"❌ Wav2Lip model not found at: {W2L_MODEL}")
 
+_w2l_lock = threading.Lock()
+_w2l_init_lock = threading.Lock()
+_w2l = None
+
+def _get_wav2lip():
+    """Import Wav2Lip-ONNX in-process and build its ONNX session once (lipsync deps are optional)"""
+    global _w2l
+    if _w2l is None:
+        # Concurrent first requests must not each build a session (and TensorRT engine)
+        with _w2l_init_lock:
+            if _w2l is None:
+                if W2L_REPO_DIR not in sys.path:
+                    sys.path.append(W2L_REPO_DIR)
+                import inference_onnxModel as w2l
+                _w2l = w2l, w2l.load_model(w2l.device, W2L_MODEL, trt_cache_path=os.path.join(CACHE_DIR, "trt"))
+    return _w2l
+
 def wav2lip_onnx(face_video, corrected_audio, out_video, model_path=W2L_MODEL):
     face_abs = os.path.abspath(face_video)
     aud_abs  = os.path.abspath(corrected_audio)
@@ -127,28 +499,38 @@ def wav2lip_onnx(face_video, corrected_audio, out_video, model_path=W2L_MODEL):
         if not os.path.exists(p):
             raise FileNotFoundError(f"{label} path does not exist: {p}")
 
-    py = sys.executable
-    cmd = [
-        py, W2L_INFER,
-        "--checkpoint_path", model_abs,
-        "--face", face_abs,
-        "--audio", aud_abs,
-        "--outfile", out_abs,
-    ]
-    print("▶", " ".join(cmd))
-    p = subprocess.run(
-        cmd,
-        cwd=W2L_REPO_DIR,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-    )
-    print(p.stdout)
-    if p.returncode != 0:
-        raise RuntimeError(f"Wav2Lip-ONNX failed.\n{p.stdout}")
+    w2l, session = _get_wav2lip()
+    # Reuse the warm session only for the default checkpoint
+    if model_abs != os.path.abspath(W2L_MODEL):
+        session = None
+    print("▶ Wav2Lip-ONNX:", face_abs, aud_abs, "->", out_abs)
+    # The inference module keeps per-run state in globals and shared temp files
+    with _w2l_lock:
+        try:
+            w2l.infer(model_abs, face_abs, aud_abs, out_abs, session=session)
+        except Exception as e:
+            raise RuntimeError(f"Wav2Lip-ONNX failed.\n{e}") from e
+
+def _is_audio_only_container(path):
+    """Cheap header sniff for formats that can't carry video (WAV, MP3, FLAC)"""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+    except OSError:
+        return False
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return True
+    if head[:3] == b"ID3" or head[:4] == b"fLaC":
+        return True
+    # Bare MPEG audio frame sync
+    return len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0
 
 def has_video_stream(path):
     """Return True if file has at least one video stream."""
+    # Skip the ffprobe launch when the header already rules video out;
+    # containers like WebM/MP4 can be either, so those still get probed
+    if _is_audio_only_container(path):
+        return False
     try:
         out = run([
             "ffprobe", "-v", "error",
@@ -160,6 +542,38 @@ def has_video_stream(path):
     except Exception:
         return False
 
+X264_ARGS = ["-c:v","libx264","-preset","veryfast","-crf","23"]
+
+def _encoder_works(encoder):
+    """1-frame test encode (ffmpeg builds list nvenc/qsv even on hosts without the hardware)"""
+    try:
+        run(["ffmpeg","-hide_banner","-loglevel","error",
+             "-f","lavfi","-i","nullsrc","-frames:v","1","-c:v", encoder, "-f","null","-"])
+        return True
+    except Exception:
+        return False
+
+@functools.lru_cache(maxsize=1)
+def h264_encoder_args():
+    """
+    Pick the fastest working H.264 encoder once per process.
+    Returns (input_args, encoder_args); falls back to libx264 on CPU.
+    """
+    try:
+        encoders = run(["ffmpeg","-hide_banner","-encoders"])
+    except Exception:
+        encoders = ""
+    hardware = [
+        ("h264_nvenc", ["-c:v","h264_nvenc","-preset","p4","-tune","ll","-rc","vbr","-cq","23"]),
+        ("h264_videotoolbox", ["-c:v","h264_videotoolbox","-q:v","55"]),
+        ("h264_qsv", ["-c:v","h264_qsv","-preset","veryfast","-global_quality","23"]),
+    ]
+    for name, encoder_args in hardware:
+        if name in encoders and _encoder_works(name):
+            # Hardware decode too (ffmpeg falls back to CPU decode if it can't)
+            return ["-hwaccel","auto"], encoder_args
+    return [], X264_ARGS
+
 def safe_mux_video_with_audio(src_video, new_audio, out_path):
     """
     If src has no video, just return the audio path.
@@ -188,19 +602,28 @@ def safe_mux_video_with_audio(src_video, new_audio, out_path):
     else:
         # Output mp4 with safe re-encode
         out_mp4 = out_path if out_path.lower().endswith(".mp4") else os.path.splitext(out_path)[0] + ".mp4"
-        run([
-            "ffmpeg","-y",
-            "-i", src_video, "-i", new_audio,
-            "-map","0:v:0", "-map","1:a:0",
-            "-c:v","libx264",         # ensure h264 for mp4
-            "-pix_fmt","yuv420p",
-            "-preset","veryfast",
-            "-crf","23",
-            "-c:a","aac",
-            "-movflags","+faststart",
-            "-shortest",
-            out_mp4
-        ])
+        def mux(input_args, encoder_args):
+            run([
+                "ffmpeg","-y",
+                *input_args, "-i", src_video, "-i", new_audio,
+                "-map","0:v:0", "-map","1:a:0",
+                *encoder_args,            # ensure h264 for mp4 (hardware encoder when available)
+                "-pix_fmt","yuv420p",
+                "-c:a","aac",
+                "-movflags","+faststart",
+                "-shortest",
+                out_mp4
+            ])
+
+        input_args, encoder_args = h264_encoder_args()
+        try:
+            mux(input_args, encoder_args)
+        except RuntimeError:
+            if encoder_args is X264_ARGS:
+                raise
+            # Hardware encoders can still fail per job (e.g. NVENC session limit) - redo it on the CPU
+            print("⚠️  Hardware H.264 encode failed; retrying with libx264")
+            mux([], X264_ARGS)
         return out_mp4
 
 # ================== FLASK APP ==================
@@ -225,55 +648,60 @@ def handle_ex(e):
     print("ERROR:", e, "\n", traceback.format_exc())
     return jsonify({"error": str(e)}), code
 
-@app.route("/api/revoice", methods=["POST"])
-def revoice():
+def process_revoice(uid, src_path, is_video, use_lipsync, voice_id=None):
     """
-    Accepts 'media' (audio/video). Optional 'use_lipsync' (true/false). Optional 'voice_id'.
-    If no voice_id, it clones a voice from the uploaded media automatically.
-    Saves results under ./outputs and returns URLs.
+    Full ReVoice pipeline for an uploaded file: ASR -> clean -> (clone) -> TTS -> lipsync/remux.
+    Returns the response payload; raises on failure.
     """
-    need_ffmpeg()
-    if "media" not in request.files:
-        return jsonify({"error":"No 'media' file part"}), 400
-
-    file = request.files["media"]
-    if not file.filename:
-        return jsonify({"error":"Empty filename"}), 400
-
-    uid = uuid.uuid4().hex
-    ext = os.path.splitext(file.filename)[1].lower() or ".webm"
-    src_path = os.path.join(OUTPUT_DIR, f"src_{uid}{ext}")
-    file.save(src_path)
-
-    # Determine if the uploaded file truly has video
-    is_video = has_video_stream(src_path)
-
-    use_lipsync = (request.form.get("use_lipsync", str(USE_LIPSYNC_DEFAULT)).lower() == "true")
-    voice_id = request.form.get("voice_id")  # may be None
-
-    tmp = tempfile.mkdtemp(prefix="revoice_")
+    tmp = tempfile.mkdtemp(prefix="revoice_", dir=tmp_root())
     try:
-        # 1) ASR audio
-        wav16 = os.path.join(tmp, "audio_16k_mono.wav")
-        extract_for_asr(src_path, wav16)
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            # 1) ASR audio (Whisper loads in parallel if it isn't warm yet)
+            ex.submit(warm_whisper)
+            wav16 = os.path.join(tmp, "audio_16k_mono.wav")
+            ref44 = os.path.join(tmp, "ref_44k.wav")
+            extract_asr_and_reference(src_path, wav16, ref44)
 
-        # 2) Whisper
-        raw_text = transcribe_whisper(wav16)
+            # 2-4) Whisper -> Gemini clean runs alongside voice cloning (independent network/CPU work)
+            # Ensure voice_id (clone from uploaded media if missing) — use the reference WAV we already have
+            clone_future = None
+            if not voice_id:
+                clone_audio = ref44  # full-band reference, decoded in the same pass as the ASR WAV
+                clone_future = ex.submit(clone_voice_cached, clone_audio, f"ReVoice-{uid}")
 
-        # 3) Clean
-        cleaned = clean_text_with_gemini(raw_text, CLEAN_MODE)
+            raw_text = transcribe_whisper(wav16)
+            if not STREAM_TTS:
+                cleaned = clean_text_with_gemini(raw_text, CLEAN_MODE)
 
-        # 4) Ensure voice_id (clone from uploaded media if missing) — use the WAV we already have
-        if not voice_id:
-            clone_audio = wav16  # safest: 16k mono wav used for Whisper
-            cloner = VoiceCloner(ELEVENLABS_API_KEY)
-            voice_id = cloner.clone_voice(clone_audio, f"ReVoice-{uid}")
-            if not voice_id:
-                return jsonify({"error":"Voice cloning failed"}), 500
+            if clone_future is not None:
+                voice_id = clone_future.result()
+                if not voice_id:
+                    raise RuntimeError("Voice cloning failed")
 
         # 5) TTS -> corrected mp3
+        # Lipsync needs a WAV of the TTS audio; decode it while the MP3 streams in
         out_mp3 = os.path.join(OUTPUT_DIR, f"tts_{uid}.mp3")
-        elevenlabs_tts_to_mp3(cleaned, out_mp3, voice_id)
+        corrected_wav = os.path.join(tmp, "tts.wav") if (is_video and use_lipsync) else None
+        try:
+            if STREAM_TTS:
+                # Gemini sentences go straight into the TTS WebSocket as they are generated
+                parts = []
+                elevenlabs_stream_tts_to_mp3(stream_clean_sentences(raw_text, CLEAN_MODE, parts),
+                                             out_mp3, voice_id, corrected_wav)
+                cleaned = "".join(parts).strip()
+            else:
+                tts_cached(cleaned, out_mp3, voice_id, corrected_wav)
+        except Exception as e:
+            # A reused clone may have been deleted since it was cached: forget it and clone again
+            if clone_future is None or not _is_voice_not_found(e):
+                raise
+            forget_cloned_voice(voice_id)
+            if STREAM_TTS:
+                raise  # the Gemini stream is already consumed; the next request re-clones
+            voice_id = clone_voice_cached(clone_audio, f"ReVoice-{uid}")
+            if not voice_id:
+                raise RuntimeError("Voice cloning failed")
+            tts_cached(cleaned, out_mp3, voice_id, corrected_wav)
 
         audio_url = f"/files/{os.path.basename(out_mp3)}"
         video_url = None
@@ -282,8 +710,6 @@ def revoice():
         if is_video:
             if use_lipsync:
                 ensure_wav2lip_paths()
-                corrected_wav = os.path.join(tmp, "tts.wav")
-                convert_to(out_mp3, corrected_wav, ar="44100", ac="2")
                 out_mp4 = os.path.join(OUTPUT_DIR, f"lips_{uid}.mp4")
                 wav2lip_onnx(src_path, corrected_wav, out_mp4, W2L_MODEL)
                 video_url = f"/files/{os.path.basename(out_mp4)}"
@@ -294,15 +720,91 @@ def revoice():
                 if out_video != out_mp3:
                     video_url = f"/files/{os.path.basename(out_video)}"
 
-        return jsonify({
+        return {
             "cleaned_text": cleaned,
             "audio_url": audio_url,
             "video_url": video_url,
             "voice_id": voice_id
-        })
+        }
     finally:
         shutil.rmtree(tmp, ignore_errors=True)
 
+# Background ReVoice jobs (opt-in with async=true); state lives in memory for this process
+_job_executor = ThreadPoolExecutor(max_workers=int(os.getenv("REVOICE_WORKERS", "2")))
+_jobs = {}
+_jobs_finished = {}  # job_id -> time.monotonic() at completion, oldest first
+_jobs_lock = threading.Lock()
+JOB_TTL_SECONDS = int(os.getenv("REVOICE_JOB_TTL", "3600"))  # finished jobs are forgotten after this
+
+def _prune_jobs():
+    """Drop finished jobs older than JOB_TTL_SECONDS (caller holds _jobs_lock)"""
+    cutoff = time.monotonic() - JOB_TTL_SECONDS
+    while _jobs_finished:
+        job_id, finished = next(iter(_jobs_finished.items()))
+        if finished > cutoff:
+            break
+        del _jobs_finished[job_id]
+        _jobs.pop(job_id, None)
+
+def _run_job(job_id, *args):
+    with _jobs_lock:
+        _jobs[job_id] = {"status": "running"}
+    try:
+        result = process_revoice(job_id, *args)
+        state = {"status": "done", "result": result}
+    except Exception as e:
+        print("ERROR:", e, "\n", traceback.format_exc())
+        state = {"status": "error", "error": str(e)}
+    with _jobs_lock:
+        _jobs[job_id] = state
+        _jobs_finished[job_id] = time.monotonic()
+        _prune_jobs()
+
+@app.route("/api/revoice", methods=["POST"])
+def revoice():
+    """
+    Accepts 'media' (audio/video). Optional 'use_lipsync' (true/false). Optional 'voice_id'.
+    If no voice_id, it clones a voice from the uploaded media automatically.
+    Saves results under ./outputs and returns URLs.
+    With 'async'=true, returns {"job_id": ...} immediately; poll /api/status/<job_id> for the result
+    (kept for REVOICE_JOB_TTL seconds after the job finishes).
+    """
+    need_ffmpeg()
+    if "media" not in request.files:
+        return jsonify({"error":"No 'media' file part"}), 400
+
+    file = request.files["media"]
+    if not file.filename:
+        return jsonify({"error":"Empty filename"}), 400
+
+    uid = uuid.uuid4().hex
+    ext = os.path.splitext(file.filename)[1].lower() or ".webm"
+    src_path = os.path.join(OUTPUT_DIR, f"src_{uid}{ext}")
+    file.save(src_path, buffer_size=UPLOAD_BUFFER_SIZE)
+
+    # Determine if the uploaded file truly has video
+    is_video = has_video_stream(src_path)
+
+    use_lipsync = (request.form.get("use_lipsync", str(USE_LIPSYNC_DEFAULT)).lower() == "true")
+    voice_id = request.form.get("voice_id")  # may be None
+
+    if request.form.get("async", "false").lower() == "true":
+        with _jobs_lock:
+            _jobs[uid] = {"status": "queued"}
+        _job_executor.submit(_run_job, uid, src_path, is_video, use_lipsync, voice_id)
+        return jsonify({"job_id": uid}), 202
+
+    return jsonify(process_revoice(uid, src_path, is_video, use_lipsync, voice_id))
+
+@app.route("/api/status/<job_id>")
+def job_status(job_id):
+    with _jobs_lock:
+        _prune_jobs()
+        state = _jobs.get(job_id)
+    if state is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify({"job_id": job_id, **state})
+
 # ================== STUTTER DETECTION ROUTES ==================
 @app.route('/api/analyze', methods=['POST'])
 def analyze_speech():
@@ -311,16 +813,16 @@ def analyze_speech():
     """
     try:
         # Clean up ALL old output files before generating new ones
+        # (single directory read, filtered by name)
         try:
-            import glob
-            for pattern in ['practice_script_*.txt', 'practice_script_*_audio.mp3']:
-                files = glob.glob(os.path.join(STUTTER_OUTPUT_FOLDER, pattern))
-                for old_file in files:
-                    try:
-                        os.remove(old_file)
-                        print(f"🧹 Cleaned up old file: {os.path.basename(old_file)}")
-                    except:
-                        pass
+            with os.scandir(STUTTER_OUTPUT_FOLDER) as it:
+                for entry in it:
+                    if entry.name.startswith('practice_script_') and entry.name.endswith(('.txt', '_audio.mp3')):
+                        try:
+                            os.remove(entry.path)
+                            print(f"🧹 Cleaned up old file: {entry.name}")
+                        except:
+                            pass
         except:
             pass
         
@@ -331,25 +833,25 @@ def analyze_speech():
         
         # Save uploaded file
         webm_path = os.path.join(UPLOAD_FOLDER, 'recording.webm')
-        audio_file.save(webm_path)
+        audio_file.save(webm_path, buffer_size=UPLOAD_BUFFER_SIZE)
         
-        # Convert webm to mp3
-        print("Converting audio to MP3...")
-        mp3_path = os.path.join(UPLOAD_FOLDER, 'recording.mp3')
-        audio = AudioSegment.from_file(webm_path, format="webm")
-        audio.export(mp3_path, format="mp3")
+        # Decode webm straight to mono WAV at the detector's onset rate
+        # (stutter_detector resamples to 16kHz for Whisper itself)
+        print("Converting audio to 22.05kHz WAV...")
+        wav_path = os.path.join(UPLOAD_FOLDER, 'recording.wav')
+        convert_to(webm_path, wav_path, ar=str(ACOUSTIC_SR), ac="1")
         
         # Debug: Show file info
         import hashlib
         import time
-        file_size = os.path.getsize(mp3_path)
-        with open(mp3_path, 'rb') as f:
+        file_size = os.path.getsize(wav_path)
+        with open(wav_path, 'rb') as f:
             file_hash = hashlib.md5(f.read()).hexdigest()[:8]
-        print(f"📊 Processing: {mp3_path} ({file_size} bytes) Hash: {file_hash} at {time.strftime('%H:%M:%S')}")
+        print(f"📊 Processing: {wav_path} ({file_size} bytes) Hash: {file_hash} at {time.strftime('%H:%M:%S')}")
         
         # Detect stutters
         print("Detecting stutters...")
-        detection_results = detect_all(mp3_path, verbose=True)
+        detection_results = detect_all(wav_path, verbose=True)
         
         events = detection_results.get('events', [])
         words = detection_results.get('words', [])
@@ -400,7 +902,7 @@ def analyze_speech():
                 sound = word[0].upper() if word else '?'
             
             # Generate practice script
-            generator = PracticeGenerator()
+            generator = get_practice_generator()
             practice_info = {
                 'word': word,
                 'sound': sound,
@@ -430,67 +932,22 @@ def analyze_speech():
                 audio_filename = None
             
             # Generate detailed therapy tips
-            advisor = SpeechTherapyAdvisor()
-            detailed_advice = advisor.generate_advice(detection_results)
+            detailed_advice = _ADVISOR.generate_advice(detection_results)
             
-            # Build comprehensive, detailed tips
-            detailed_tips = ""
+            # Build comprehensive, detailed tips: static type/sound sections are precomputed,
+            # only the word-specific section is generated per request
             sound_lower = sound.lower() if sound else ""
-            
-            # 1. WHY THIS HAPPENS - Be specific!
             stutter_lookup = stutter_type if stutter_type != 'acoustic_repetition' else 'repetition'
-            if stutter_lookup in advisor.tips:
-                tip_data = advisor.tips[stutter_lookup]
-                detailed_tips += f"🔍 WHY THIS HAPPENS:\n{tip_data['why_it_happens']}\n\n"
-            
-            # 2. SOUND-SPECIFIC ARTICULATION - Very detailed!
-            if sound_lower in advisor.sound_guidance:
-                sound_info = advisor.sound_guidance[sound_lower]
-                detailed_tips += f"🗣️ CORRECT MOUTH POSITION FOR '{sound.upper()}':\n"
-                detailed_tips += f"• WHERE: {sound_info['position']}\n"
-                detailed_tips += f"• COMMON MISTAKE: {sound_info['common_issue']}\n"
-                detailed_tips += f"• HOW TO FIX: {sound_info['fix']}\n\n"
+            key = (stutter_lookup, sound_lower)
+            tips_head, tips_tail = _TIPS_CACHE.get(key) or _build_tips(*key)
             
             # 3. STEP-BY-STEP WORD GUIDANCE
+            word_tips = ""
             if 'word_specific_guidance' in detailed_advice and detailed_advice['word_specific_guidance']:
                 guidance = detailed_advice['word_specific_guidance'][0]  # Get first (most relevant)
-                detailed_tips += f"📝 HOW TO SAY '{word.upper()}':\n{guidance['how_to_say_it']}\n\n"
+                word_tips = f"📝 HOW TO SAY '{word.upper()}':\n{guidance['how_to_say_it']}\n\n"
             
-            # 4. KEY TECHNIQUES - Full, not truncated!
-            if stutter_lookup in advisor.tips:
-                tip_data = advisor.tips[stutter_lookup]
-                techniques = tip_data.get('techniques', [])
-                if techniques:
-                    detailed_tips += "💡 TECHNIQUES TO PRACTICE:\n"
-                    for i, technique in enumerate(techniques, 1):
-                        # Remove markdown formatting for cleaner display
-                        clean_tech = technique.replace('**', '')
-                        detailed_tips += f"{i}. {clean_tech}\n\n"
-            
-            # 5. PRACTICE EXERCISES - Specific, actionable
-            if stutter_lookup in advisor.tips:
-                tip_data = advisor.tips[stutter_lookup]
-                exercises = tip_data.get('exercises', [])
-                if exercises:
-                    detailed_tips += "🏋️ PRACTICE EXERCISES:\n"
-                    for i, exercise in enumerate(exercises, 1):
-                        clean_ex = exercise.replace('**', '')
-                        detailed_tips += f"{i}. {clean_ex}\n\n"
-            
-            # 6. SPECIFIC PRACTICE FOR THIS SOUND
-            if sound_lower in advisor.sound_guidance:
-                sound_info = advisor.sound_guidance[sound_lower]
-                detailed_tips += f"🎯 SPECIFIC PRACTICE FOR '{sound.upper()}':\n{sound_info['practice']}\n\n"
-            
-            # 7. MOUTH POSITIONS - Physical guidance
-            if stutter_lookup in advisor.tips:
-                tip_data = advisor.tips[stutter_lookup]
-                mouth_positions = tip_data.get('mouth_positions', [])
-                if mouth_positions:
-                    detailed_tips += "👄 CORRECT MOUTH POSITIONS:\n"
-                    for pos in mouth_positions:
-                        detailed_tips += f"• {pos}\n"
-                    detailed_tips += "\n"
+            detailed_tips = tips_head + word_tips + tips_tail
             
             response_data['practice'] = {
                 'word': word,
@@ -504,11 +961,7 @@ def analyze_speech():
         # Clean up temp files
         try:
             os.remove(webm_path)
-            os.remove(mp3_path)
-            # Also clean up the WAV file created by stutter_detector
-            wav_path = mp3_path.replace('.mp3', '.wav')
-            if os.path.exists(wav_path):
-                os.remove(wav_path)
+            os.remove(wav_path)
         except:
             pass
         
@@ -535,6 +988,88 @@ def get_practice_audio(filename):
         return jsonify({'error': str(e)}), 500
 
 
+# ================== PRACTICE GENERATOR ==================
+_practice_generator = None
+_practice_generator_lock = threading.Lock()
+
+def get_practice_generator():
+    """Shared PracticeGenerator (and its Gemini client), created on first use"""
+    global _practice_generator
+    if _practice_generator is None:
+        with _practice_generator_lock:
+            if _practice_generator is None:
+                _practice_generator = PracticeGenerator()
+    return _practice_generator
+
+# ================== THERAPY TIPS ==================
+_ADVISOR = SpeechTherapyAdvisor()
+
+def _build_tips(stutter_lookup, sound_lower):
+    """
+    Static parts of the detailed tips for a (stutter type, sound) pair.
+    Returns (head, tail): the word-specific section goes between them.
+    """
+    advisor = _ADVISOR
+    head = ""
+    tail = ""
+    tip_data = advisor.tips.get(stutter_lookup)
+    sound_info = advisor.sound_guidance.get(sound_lower)
+    sound_upper = sound_lower.upper()
+    
+    # 1. WHY THIS HAPPENS - Be specific!
+    if tip_data:
+        head += f"🔍 WHY THIS HAPPENS:\n{tip_data['why_it_happens']}\n\n"
+    
+    # 2. SOUND-SPECIFIC ARTICULATION - Very detailed!
+    if sound_info:
+        head += f"🗣️ CORRECT MOUTH POSITION FOR '{sound_upper}':\n"
+        head += f"• WHERE: {sound_info['position']}\n"
+        head += f"• COMMON MISTAKE: {sound_info['common_issue']}\n"
+        head += f"• HOW TO FIX: {sound_info['fix']}\n\n"
+    
+    # (3. STEP-BY-STEP WORD GUIDANCE is per request)
+    
+    # 4. KEY TECHNIQUES - Full, not truncated!
+    if tip_data:
+        techniques = tip_data.get('techniques', [])
+        if techniques:
+            tail += "💡 TECHNIQUES TO PRACTICE:\n"
+            for i, technique in enumerate(techniques, 1):
+                # Remove markdown formatting for cleaner display
+                clean_tech = technique.replace('**', '')
+                tail += f"{i}. {clean_tech}\n\n"
+    
+    # 5. PRACTICE EXERCISES - Specific, actionable
+    if tip_data:
+        exercises = tip_data.get('exercises', [])
+        if exercises:
+            tail += "🏋️ PRACTICE EXERCISES:\n"
+            for i, exercise in enumerate(exercises, 1):
+                clean_ex = exercise.replace('**', '')
+                tail += f"{i}. {clean_ex}\n\n"
+    
+    # 6. SPECIFIC PRACTICE FOR THIS SOUND
+    if sound_info:
+        tail += f"🎯 SPECIFIC PRACTICE FOR '{sound_upper}':\n{sound_info['practice']}\n\n"
+    
+    # 7. MOUTH POSITIONS - Physical guidance
+    if tip_data:
+        mouth_positions = tip_data.get('mouth_positions', [])
+        if mouth_positions:
+            tail += "👄 CORRECT MOUTH POSITIONS:\n"
+            for pos in mouth_positions:
+                tail += f"• {pos}\n"
+            tail += "\n"
+    
+    return head, tail
+
+# Every known (type, sound) combination, built once at import
+_TIPS_CACHE = {
+    (stype, sound): _build_tips(stype, sound)
+    for stype in _ADVISOR.tips
+    for sound in _ADVISOR.sound_guidance
+}
+
 def _create_summary(detection_results):
     """Create a summary of detection results for the frontend"""
     events = detection_results.get('events', [])
@@ -546,17 +1081,14 @@ def _create_summary(detection_results):
             'events_detail': []
         }
     
-    # Count each stutter type
-    stutter_types = {}
-    for event in events:
-        stype = event.get('type', 'unknown')
-        stutter_types[stype] = stutter_types.get(stype, 0) + 1
-    
-    # Format detailed events
+    # Count each stutter type and format detailed events in one pass
+    stutter_types = Counter()
     events_detail = []
     for event in events:
+        stype = event.get('type', 'unknown')
+        stutter_types[stype] += 1
         events_detail.append({
-            'type': event.get('type', 'unknown'),
+            'type': stype,
             'word': event.get('word', 'unknown'),
             'time': f"{event.get('start', 0):.1f}s",
             'confidence': f"{int(event.get('confidence', 0.5) * 100)}%"
@@ -564,11 +1096,15 @@ def _create_summary(detection_results):
     
     return {
         'message': f"Found {len(events)} stutter event(s)",
-        'stutter_types': stutter_types,
+        'stutter_types': dict(stutter_types),
         'events_detail': events_detail
     }
 
 
 if __name__ == "__main__":
     print(f"→ ReVoice API (with Stutter Detection) on http://localhost:{PORT}")
-    app.run(host="0.0.0.0", port=PORT, debug=True)
+    # Threaded, no reloader: one warm process (Whisper, ONNX session, API clients) serves
+    # overlapping requests. For production: gunicorn server:app --workers 1 --threads 16 --timeout 120
+    # Load Whisper in the background so the first request doesn't pay for it
+    threading.Thread(target=warm_whisper, daemon=True).start()
+    app.run(host="0.0.0.0", port=PORT, threaded=True, debug=os.getenv("FLASK_DEBUG") == "1")
@@ -1,14 +1,16 @@
-import whisper
+from faster_whisper import WhisperModel
 
 # Load model (options: tiny, base, small, medium, large)
-model = whisper.load_model("base")
+# int8 CTranslate2 weights; device="auto" picks CUDA when available
+model = WhisperModel("base", device="auto", compute_type="int8")
 
-# Transcribe
-result = model.transcribe("trimm.mp3")
+# Transcribe (VAD skips silence before decoding)
+segments, _ = model.transcribe("trimm.mp3", beam_size=1, vad_filter=True)
+text = " ".join(segment.text.strip() for segment in segments)
 
 # Print transcription
-print(result["text"])
+print(text)
 
 # Save to file
 with open("transcription.txt", "w") as f:
-    f.write(result["text"])
\ No newline at end of file
+    f.write(text)
@@ -1,7 +1,19 @@
 import requests
 import os
+import mimetypes
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+# Optional: streams multipart uploads instead of building the whole body in memory
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# One pooled session for all ElevenLabs calls - keeps the TLS connection warm between requests
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 class VoiceCloner:
     def __init__(self, api_key):
         self.api_key = api_key
@@ -25,17 +37,26 @@ class VoiceCloner:
         
         # Open the audio file
         with open(audio_file_path, 'rb') as audio_file:
-            files = {
-                'files': audio_file
-            }
-            
             data = {
                 'name': voice_name,
                 'description': 'ReVoice user voice clone'
             }
             
             print("⏳ Sending to ElevenLabs...")
-            response = requests.post(url, headers=headers, files=files, data=data)
+            if MultipartEncoder is not None:
+                # Body is read from the file chunk by chunk as it is sent (constant memory)
+                content_type = mimetypes.guess_type(audio_file_path)[0] or 'application/octet-stream'
+                encoder = MultipartEncoder(fields={
+                    **data,
+                    'files': (os.path.basename(audio_file_path), audio_file, content_type)
+                })
+                headers["Content-Type"] = encoder.content_type
+                response = _SESSION.post(url, headers=headers, data=encoder)
+            else:
+                files = {
+                    'files': audio_file
+                }
+                response = _SESSION.post(url, headers=headers, files=files, data=data)
         
         # Check if successful
         if response.status_code == 200:
@@ -54,7 +75,7 @@ class VoiceCloner:
         url = f"{self.base_url}/voices"
         headers = {"xi-api-key": self.api_key}
         
-        response = requests.get(url, headers=headers)
+        response = _SESSION.get(url, headers=headers)
         
         if response.status_code == 200:
             voices = response.json()['voices']
@@ -71,7 +92,7 @@ class VoiceCloner:
         url = f"{self.base_url}/voices/{voice_id}"
         headers = {"xi-api-key": self.api_key}
         
-        response = requests.delete(url, headers=headers)
+        response = _SESSION.delete(url, headers=headers)
         
         if response.status_code == 200:
             print(f"✅ Voice {voice_id} deleted successfully")